@@ -9,7 +9,7 @@ Input:
     - data/raw/DA_outbound_call_nursing_team.csv (1,988 raw records)
 
 Output:
-    - data/processed/cleaned_screening_data.csv (validated dataset)
+    - data/processed/cleaned_screening_data.parquet (validated dataset)
 
 Transformations:
     - Validates screening types against approved list
@@ -23,23 +23,74 @@ Date: January 2026
 """
 
 import pandas as pd
+import numpy as np
 import os
 from datetime import datetime
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # PyArrow is optional; fall back to the pandas C parser
+    pa = None
+
+from config import PROCESSED_DATA_PATH
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
 # File paths
 RAW_DATA_PATH = '../data/raw/DA_outbound_call_nursing_team.csv'
-PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.csv'
+
+# Columns the cleaning pipeline uses; any extra export columns are skipped at parse time
+RAW_COLUMNS = [
+    'patient_id', 'screening_type', 'screening_completed_ind',
+    'screening_date', 'latest_call_date', 'reached_ind'
+]
+
+# Columns parsed as raw strings: patient_id is a 22-digit identifier that
+# float64 would truncate, and the indicators are decoded token by token
+# (numeric inference would promote them to float64 just to hold blanks)
+STRING_COLUMNS = ['patient_id', 'screening_completed_ind', 'reached_ind']
 
 # Valid screening types per specification
 VALID_SCREENING_TYPES = ['BCS', 'COL', 'EED', 'CBP', 'OMW']
 
-# Display configuration
-pd.set_option('display.max_columns', None)
-pd.set_option('display.width', None)
+# Categorical domains for the low-cardinality columns (alphabetical, so
+# sorted groupbys and reports keep the same order as plain strings)
+SCREENING_TYPE_DTYPE = pd.CategoricalDtype(sorted(VALID_SCREENING_TYPES))
+COMPLETION_DTYPE = pd.CategoricalDtype(['completed', 'not completed', 'not eligible'])
+REACH_DTYPE = pd.CategoricalDtype(['not called', 'not reached', 'reached'])
+
+# ==========================================
+# HELPERS
+# ==========================================
+
+def classify_indicator(values, token_labels, missing_label, dtype):
+    """
+    Map a raw indicator column onto a categorical with one hash lookup.
+
+    Values are compared as stripped strings against token_labels; anything
+    unmatched (blank, NaN, unparseable) gets missing_label.
+    """
+    tokens = values.astype(str).str.strip()
+    positions = pd.Index(list(token_labels)).get_indexer(tokens)
+    # get_indexer returns -1 for unmatched tokens, selecting the trailing code
+    code_table = dtype.categories.get_indexer(
+        [*token_labels.values(), missing_label]
+    ).astype(np.int8)
+    return pd.Categorical.from_codes(code_table[positions], dtype=dtype)
+
+
+def format_distribution(counts, total, prefix):
+    """
+    Render counts as 'label: count (pct%)' report lines in a single block.
+    """
+    percentages = counts / total * 100
+    return "\n".join(
+        f"{prefix}{label}: {count:,} ({pct:.1f}%)"
+        for label, count, pct in zip(counts.index, counts.to_numpy(), percentages.to_numpy())
+    )
 
 # ==========================================
 # 1. LOAD RAW DATA
@@ -54,7 +105,18 @@ print(f"\nExecution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 if not os.path.exists(RAW_DATA_PATH):
     raise FileNotFoundError(f"Raw data file not found: {RAW_DATA_PATH}")
 
-df = pd.read_csv(RAW_DATA_PATH)
+# Parse with PyArrow's multi-threaded reader when available
+if pa is not None:
+    df = pa_csv.read_csv(
+        RAW_DATA_PATH,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=RAW_COLUMNS,
+            column_types={col: pa.string() for col in STRING_COLUMNS},
+            strings_can_be_null=True
+        )
+    ).to_pandas()
+else:
+    df = pd.read_csv(RAW_DATA_PATH, usecols=RAW_COLUMNS, dtype=dict.fromkeys(STRING_COLUMNS, str))
 
 print(f"\n{'─' * 70}")
 print("STEP 1: RAW DATA LOADED")
@@ -79,16 +141,22 @@ print(f"  ✓ Unique patients: {df['patient_id'].nunique():,}")
 
 # 2.2 Screening Type Validation
 print("\n[2/6] Cleaning screening_type...")
-df['screening_type'] = df['screening_type'].str.strip().str.upper()
+# Arrow-backed strings run strip/upper as PyArrow compute kernels
+string_dtype = 'string[pyarrow]' if pa is not None else 'string'
+screening_types = df['screening_type'].astype(string_dtype).str.strip().str.upper()
+
+# Encode against the valid types; anything else gets code -1
+screening_cat = pd.Categorical(screening_types, dtype=SCREENING_TYPE_DTYPE)
+valid_type_mask = screening_cat.codes != -1
 
 # Identify invalid types
-invalid_types = df[~df['screening_type'].isin(VALID_SCREENING_TYPES)]['screening_type'].unique()
+invalid_types = screening_types[~valid_type_mask].unique()
 if len(invalid_types) > 0:
     print(f"  ⚠ Invalid types found: {list(invalid_types)}")
 
 # Remove invalid records
 records_before = len(df)
-df = df[df['screening_type'].isin(VALID_SCREENING_TYPES)]
+df = df.loc[valid_type_mask].assign(screening_type=screening_cat[valid_type_mask])
 records_removed = records_before - len(df)
 
 print(f"  ✓ Records removed: {records_removed}")
@@ -99,30 +167,27 @@ print("\n[3/6] Standardizing screening_completed_ind...")
 
 # Mapping for boolean values
 completion_mapping = {
-    '0': 0, '0.0': 0, 0: 0, 0.0: 0,
-    '1': 1, '1.0': 1, 1: 1, 1.0: 1,
-    's': 1, 'S': 1  # Handle inconsistent 's' values
+    '0': 'not completed', '0.0': 'not completed',
+    '1': 'completed', '1.0': 'completed',
+    's': 'completed', 'S': 'completed'  # Handle inconsistent 's' values
 }
 
-df['screening_completed_ind'] = df['screening_completed_ind'].replace(completion_mapping)
-df['screening_completed_ind'] = pd.to_numeric(df['screening_completed_ind'], errors='coerce')
-
-# Convert to descriptive text
-df['screening_completed_ind'] = df['screening_completed_ind'].map({
-    0: 'not completed',
-    1: 'completed'
-})
-df['screening_completed_ind'] = df['screening_completed_ind'].fillna('not eligible')
+# Convert to descriptive text (missing/unparseable → not eligible)
+df['screening_completed_ind'] = classify_indicator(
+    df['screening_completed_ind'],
+    completion_mapping,
+    missing_label='not eligible',
+    dtype=COMPLETION_DTYPE
+)
 
 # Distribution
 completion_dist = df['screening_completed_ind'].value_counts()
 print(f"  ✓ Distribution:")
-for status, count in completion_dist.items():
-    print(f"      {status}: {count:,} ({count/len(df)*100:.1f}%)")
+print(format_distribution(completion_dist, len(df), prefix="      "))
 
 # 2.4 Screening Date
 print("\n[4/6] Converting screening_date to datetime...")
-df['screening_date'] = pd.to_datetime(df['screening_date'], errors='coerce', format='%Y-%m-%d')
+df['screening_date'] = pd.to_datetime(df['screening_date'], errors='coerce', format='ISO8601', cache=True)
 
 valid_dates = df['screening_date'].notna().sum()
 print(f"  ✓ Valid dates: {valid_dates:,}")
@@ -131,7 +196,7 @@ if valid_dates > 0:
 
 # 2.5 Latest Call Date
 print("\n[5/6] Converting latest_call_date to datetime...")
-df['latest_call_date'] = pd.to_datetime(df['latest_call_date'], errors='coerce', format='%Y-%m-%d')
+df['latest_call_date'] = pd.to_datetime(df['latest_call_date'], errors='coerce', format='ISO8601', cache=True)
 
 valid_call_dates = df['latest_call_date'].notna().sum()
 print(f"  ✓ Valid call dates: {valid_call_dates:,}")
@@ -143,32 +208,30 @@ print("\n[6/6] Standardizing reached_ind...")
 
 # Mapping for reach status
 reach_mapping = {
-    '0': 0, '0.0': 0, 0: 0, 0.0: 0,
-    '1': 1, '1.0': 1, 1: 1, 1.0: 1,
-    '1 and reached': 1
+    '0': 'not reached', '0.0': 'not reached',
+    '1': 'reached', '1.0': 'reached',
+    '1 and reached': 'reached'
 }
 
-df['reached_ind'] = df['reached_ind'].replace(reach_mapping)
-df['reached_ind'] = pd.to_numeric(df['reached_ind'], errors='coerce')
-
-# Convert to descriptive text
-df['reached_ind'] = df['reached_ind'].map({
-    0: 'not reached',
-    1: 'reached'
-})
-df['reached_ind'] = df['reached_ind'].fillna('not called')
+# Convert to descriptive text (missing/unparseable → not called)
+df['reached_ind'] = classify_indicator(
+    df['reached_ind'],
+    reach_mapping,
+    missing_label='not called',
+    dtype=REACH_DTYPE
+)
 
 # Distribution
 reach_dist = df['reached_ind'].value_counts()
 print(f"  ✓ Distribution:")
-for status, count in reach_dist.items():
-    print(f"      {status}: {count:,} ({count/len(df)*100:.1f}%)")
+print(format_distribution(reach_dist, len(df), prefix="      "))
 
-# Enforce logical consistency
-inconsistencies = (df['reached_ind'] == 'not called') & (df['latest_call_date'].notna())
-if inconsistencies.sum() > 0:
-    print(f"  ⚠ Fixing {inconsistencies.sum()} logical inconsistencies (not called but has call date)")
-    df.loc[df['reached_ind'] == 'not called', 'latest_call_date'] = pd.NaT
+# Enforce logical consistency (not-called mask built once from the int8 codes)
+not_called = df['reached_ind'].cat.codes.to_numpy() == REACH_DTYPE.categories.get_loc('not called')
+inconsistencies = (not_called & df['latest_call_date'].notna().to_numpy()).sum()
+if inconsistencies > 0:
+    print(f"  ⚠ Fixing {inconsistencies} logical inconsistencies (not called but has call date)")
+    df['latest_call_date'] = df['latest_call_date'].mask(not_called)
 
 # ==========================================
 # 3. SAVE CLEANED DATA
@@ -180,12 +243,10 @@ print(f"{'─' * 70}")
 
 # Ensure output directory exists
 output_dir = os.path.dirname(PROCESSED_DATA_PATH)
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-    print(f"  ✓ Created directory: {output_dir}")
+os.makedirs(output_dir, exist_ok=True)
 
-# Save cleaned dataset
-df.to_csv(PROCESSED_DATA_PATH, index=False)
+# Save cleaned dataset (Parquet keeps the datetime and categorical dtypes)
+df.to_parquet(PROCESSED_DATA_PATH, compression='zstd', index=False)
 file_size = os.path.getsize(PROCESSED_DATA_PATH) / 1024  # KB
 
 print(f"  ✓ File saved: {PROCESSED_DATA_PATH}")
@@ -216,12 +277,10 @@ null_counts = df.isnull().sum()
 if null_counts.sum() == 0:
     print(f"  ✓ No unexpected missing values")
 else:
-    for col, count in null_counts[null_counts > 0].items():
-        print(f"  • {col}: {count:,} ({count/len(df)*100:.1f}%)")
+    print(format_distribution(null_counts[null_counts > 0], len(df), prefix="  • "))
 
 print(f"\nScreening Type Distribution:")
-for screening, count in df['screening_type'].value_counts().sort_index().items():
-    print(f"  • {screening}: {count:,} ({count/len(df)*100:.1f}%)")
+print(format_distribution(df['screening_type'].value_counts().sort_index(), len(df), prefix="  • "))
 
 # ==========================================
 # 5. VALIDATION CHECKS
@@ -252,7 +311,7 @@ else:
     checks_passed = False
 
 # Check 3: Logical consistency
-consistency_check = ((df['reached_ind'] == 'not called') & (df['latest_call_date'].notna())).sum()
+consistency_check = df.eval("reached_ind == 'not called' and latest_call_date.notna()").sum()
 if consistency_check == 0:
     print("  ✓ Logical consistency maintained (not called = no call date)")
 else:
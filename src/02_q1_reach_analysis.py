@@ -10,7 +10,7 @@ Business Question:
     "How many patients were reached successfully?"
 
 Input:
-    - data/processed/cleaned_screening_data.csv
+    - data/processed/cleaned_screening_data.parquet
 
 Outputs:
     - visualizations/q1_reach_analysis/Q1_Graph1_Reach_Distribution.png
@@ -28,33 +28,25 @@ Date: January 2026
 """
 
 import pandas as pd
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the scripts only write image files
 import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 from datetime import datetime
 
+from config import FIGURE_DPI, COLORS
+from utils import configure_matplotlib, load_cleaned
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
 # File paths
-PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.csv'
 OUTPUT_DIR = '../visualizations/q1_reach_analysis/'
 
-# Professional color palette
-COLORS = {
-    'primary': '#1F3A93',      # Dark blue
-    'secondary': '#3A66B7',    # Medium blue
-    'accent': '#A7C7F2',       # Light blue
-    'dark': '#4A4A4A',         # Dark gray
-    'light': '#D9D9D9'         # Light gray
-}
-
-# Matplotlib configuration for professional plots
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
-plt.rcParams['axes.spines.top'] = False
-plt.rcParams['axes.spines.right'] = False
+# Matplotlib configuration
+configure_matplotlib()
 
 # ==========================================
 # 1. LOAD CLEANED DATA
@@ -65,21 +57,17 @@ print("Q1: PATIENT REACH ANALYSIS")
 print("=" * 70)
 print(f"\nExecution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Verify file exists
-if not os.path.exists(PROCESSED_DATA_PATH):
-    raise FileNotFoundError(
-        f"Cleaned data not found: {PROCESSED_DATA_PATH}\n"
-        f"Please run 01_data_cleaning.py first."
-    )
-
-# Load cleaned data
-df = pd.read_csv(PROCESSED_DATA_PATH)
+# Load cleaned data (cached per process)
+df = load_cleaned()
 
 print(f"\n{'─' * 70}")
 print("STEP 1: DATA LOADED")
 print(f"{'─' * 70}")
+# Unique patient count is reused for all percentages below
+total_patients = df['patient_id'].nunique()
+
 print(f"Records loaded: {len(df):,}")
-print(f"Unique patients: {df['patient_id'].nunique():,}")
+print(f"Unique patients: {total_patients:,}")
 
 # ==========================================
 # 2. CALCULATE REACH METRICS
@@ -89,12 +77,15 @@ print(f"\n{'─' * 70}")
 print("STEP 2: CALCULATING REACH METRICS")
 print(f"{'─' * 70}")
 
-# Calculate unique patients by reach status
-reach_summary = df.groupby('reached_ind')['patient_id'].nunique().reset_index()
-reach_summary.columns = ['reach_status', 'unique_patients']
+# Calculate unique patients by reach status: dedupe (patient, status) pairs,
+# then histogram the categorical codes
+reach_categories = df['reached_ind'].cat.categories
+reach_codes = df.drop_duplicates(['patient_id', 'reached_ind'])['reached_ind'].cat.codes.to_numpy()
+reach_summary = pd.DataFrame({
+    'reach_status': reach_categories,
+    'unique_patients': np.bincount(reach_codes, minlength=len(reach_categories))
+})
 
-# Calculate total patients
-total_patients = df['patient_id'].nunique()
 reach_summary['percentage'] = (reach_summary['unique_patients'] / total_patients * 100).round(1)
 
 # Extract key metrics
@@ -122,9 +113,7 @@ print("STEP 3: GENERATING VISUALIZATIONS")
 print(f"{'─' * 70}")
 
 # Create output directory if it doesn't exist
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-    print(f"  ✓ Created directory: {OUTPUT_DIR}")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # --- GRAPH 1: PIE CHART - REACH STATUS DISTRIBUTION ---
 
@@ -168,7 +157,7 @@ ax.legend(
 
 plt.tight_layout()
 graph1_path = os.path.join(OUTPUT_DIR, 'Q1_Graph1_Reach_Distribution.png')
-plt.savefig(graph1_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph1_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 1 saved: {graph1_path}")
 plt.close()
 
@@ -221,7 +210,7 @@ ax.tick_params(axis='y', labelsize=10, colors=COLORS['dark'])
 
 plt.tight_layout()
 graph2_path = os.path.join(OUTPUT_DIR, 'Q1_Graph2_Reach_Counts.png')
-plt.savefig(graph2_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph2_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 2 saved: {graph2_path}")
 plt.close()
 
@@ -11,7 +11,7 @@ Business Question:
     a patient was eligible for?"
 
 Input:
-    - data/processed/cleaned_screening_data.csv
+    - data/processed/cleaned_screening_data.parquet
 
 Outputs:
     - visualizations/q2_compliance_eligibility/Q2_Graph1_Compliance_by_Eligibility.png
@@ -33,28 +33,22 @@ Date: January 2026
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the scripts only write image files
 import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 from datetime import datetime
 
+from config import FIGURE_DPI, COLORS
+from utils import configure_matplotlib, load_cleaned
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
 # File paths
-PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.csv'
 OUTPUT_DIR = '../visualizations/q2_compliance_eligibility/'
 
-# Professional color palette
-COLORS = {
-    'primary': '#1F3A93',      # Dark blue
-    'secondary': '#3A66B7',    # Medium blue
-    'accent': '#A7C7F2',       # Light blue
-    'dark': '#4A4A4A',         # Dark gray
-    'light': '#D9D9D9'         # Light gray
-}
-
 # Blue gradient for multiple bars
 BLUE_GRADIENT = [
     '#1F3A93',  # Dark blue
@@ -65,10 +59,7 @@ BLUE_GRADIENT = [
 ]
 
 # Matplotlib configuration
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
-plt.rcParams['axes.spines.top'] = False
-plt.rcParams['axes.spines.right'] = False
+configure_matplotlib()
 
 # ==========================================
 # 1. LOAD CLEANED DATA
@@ -79,15 +70,8 @@ print("Q2: COMPLIANCE BY SCREENING ELIGIBILITY ANALYSIS")
 print("=" * 70)
 print(f"\nExecution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Verify file exists
-if not os.path.exists(PROCESSED_DATA_PATH):
-    raise FileNotFoundError(
-        f"Cleaned data not found: {PROCESSED_DATA_PATH}\n"
-        f"Please run 01_data_cleaning.py first."
-    )
-
-# Load cleaned data
-df = pd.read_csv(PROCESSED_DATA_PATH)
+# Load cleaned data (cached per process)
+df = load_cleaned()
 
 print(f"\n{'─' * 70}")
 print("STEP 1: DATA LOADED")
@@ -108,11 +92,17 @@ df_eligible = df[df['screening_completed_ind'] != 'not eligible'].copy()
 
 print(f"Eligible screening records: {len(df_eligible):,}")
 
-# Calculate patient-level metrics
-patient_metrics = df_eligible.groupby('patient_id').agg(
-    total_eligible_screenings=('screening_type', 'count'),
-    completed_screenings=('screening_completed_ind', lambda x: (x == 'completed').sum())
-).reset_index()
+# Flag completed screenings once so the aggregation uses built-in reducers
+df_eligible = df_eligible.assign(
+    is_completed=df_eligible['screening_completed_ind'].eq('completed').astype('int8')
+)
+
+# Calculate patient-level metrics from a single group index
+patient_groups = df_eligible.groupby('patient_id', sort=False)
+patient_metrics = pd.DataFrame({
+    'total_eligible_screenings': patient_groups.size(),
+    'completed_screenings': patient_groups['is_completed'].sum()
+}).reset_index()
 
 # Calculate compliance rate per patient
 patient_metrics['compliance_rate'] = (
@@ -167,9 +157,7 @@ print("STEP 4: GENERATING VISUALIZATIONS")
 print(f"{'─' * 70}")
 
 # Create output directory
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-    print(f"  ✓ Created directory: {OUTPUT_DIR}")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # --- GRAPH 1: AVERAGE COMPLIANCE RATE BY ELIGIBILITY ---
 
@@ -224,7 +212,7 @@ ax.set_xticks(compliance_by_eligibility['total_eligible_screenings'])
 
 plt.tight_layout()
 graph1_path = os.path.join(OUTPUT_DIR, 'Q2_Graph1_Compliance_by_Eligibility.png')
-plt.savefig(graph1_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph1_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 1 saved: {graph1_path}")
 plt.close()
 
@@ -277,7 +265,7 @@ ax.set_xticks(compliance_by_eligibility['total_eligible_screenings'])
 
 plt.tight_layout()
 graph2_path = os.path.join(OUTPUT_DIR, 'Q2_Graph2_Patient_Distribution.png')
-plt.savefig(graph2_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph2_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 2 saved: {graph2_path}")
 plt.close()
 
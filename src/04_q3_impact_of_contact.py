@@ -12,7 +12,7 @@ Business Question:
     compliant) after we reach them compared to patients we do not reach?"
 
 Input:
-    - data/processed/cleaned_screening_data.csv
+    - data/processed/cleaned_screening_data.parquet
 
 Outputs:
     - visualizations/q3_impact_analysis/Q3_Graph1_Completion_by_Reach.png
@@ -35,41 +35,28 @@ Date: January 2026
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the scripts only write image files
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import os
 from datetime import datetime
 
+from config import PROCESSED_DATA_PATH, FINAL_RENDER, FIGURE_DPI, PNG_PIL_KWARGS, COLORS, REACH_COLORS
+from utils import configure_matplotlib, load_cleaned, needs_rebuild
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
 # File paths
-PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.csv'
 OUTPUT_DIR = '../visualizations/q3_impact_analysis/'
 
-# Professional color palette
-COLORS = {
-    'primary': '#1F3A93',      # Dark blue
-    'secondary': '#3A66B7',    # Medium blue
-    'accent': '#A7C7F2',       # Light blue
-    'dark': '#4A4A4A',         # Dark gray
-    'light': '#D9D9D9'         # Light gray
-}
-
-# Color mapping for reach status
-REACH_COLORS = {
-    'reached': '#1F3A93',      # Dark blue (best performance)
-    'not reached': '#3A66B7',  # Medium blue
-    'not called': '#D9D9D9'    # Light gray (baseline)
-}
+# Columns used by this analysis (only these are read from the Parquet file)
+ANALYSIS_COLUMNS = ['patient_id', 'reached_ind', 'screening_completed_ind', 'screening_type']
 
 # Matplotlib configuration
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
-plt.rcParams['axes.spines.top'] = False
-plt.rcParams['axes.spines.right'] = False
+configure_matplotlib()
 
 # ==========================================
 # 1. LOAD CLEANED DATA
@@ -80,21 +67,19 @@ print("Q3: IMPACT OF PATIENT CONTACT ANALYSIS")
 print("=" * 70)
 print(f"\nExecution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Verify file exists
-if not os.path.exists(PROCESSED_DATA_PATH):
-    raise FileNotFoundError(
-        f"Cleaned data not found: {PROCESSED_DATA_PATH}\n"
-        f"Please run 01_data_cleaning.py first."
-    )
+# Load cleaned data (patient_id decoded straight from the Parquet dictionary)
+df = load_cleaned(columns=ANALYSIS_COLUMNS, read_dictionary=['patient_id'])
 
-# Load cleaned data
-df = pd.read_csv(PROCESSED_DATA_PATH)
+# Completion category codes, resolved once for the integer masks below
+COMPLETION_CATEGORIES = df['screening_completed_ind'].cat.categories
+COMPLETED_CODE = COMPLETION_CATEGORIES.get_loc('completed')
+NOT_ELIGIBLE_CODE = COMPLETION_CATEGORIES.get_loc('not eligible')
 
 print(f"\n{'─' * 70}")
 print("STEP 1: DATA LOADED")
 print(f"{'─' * 70}")
 print(f"Total records loaded: {len(df):,}")
-print(f"Unique patients: {df['patient_id'].nunique():,}")
+print(f"Unique patients: {len(df['patient_id'].cat.categories):,}")
 
 # ==========================================
 # 2. ANALYZE COMPLETION BY REACH STATUS
@@ -104,16 +89,27 @@ print(f"\n{'─' * 70}")
 print("STEP 2: CALCULATING COMPLETION RATES BY REACH STATUS")
 print(f"{'─' * 70}")
 
-# Filter only eligible screenings
-df_eligible = df[df['screening_completed_ind'] != 'not eligible'].copy()
+# Filter only eligible screenings (integer compare on the categorical codes)
+df_eligible = df.loc[df['screening_completed_ind'].cat.codes.to_numpy() != NOT_ELIGIBLE_CODE]
 
 print(f"Eligible screening records: {len(df_eligible):,}")
 
-# Calculate completion metrics by reach status
-compliance_by_reach = df_eligible.groupby('reached_ind').agg(
-    total_screenings=('screening_type', 'count'),
-    completed_screenings=('screening_completed_ind', lambda x: (x == 'completed').sum())
-).reset_index()
+# Flag completed screenings on the codes (same categories as the full frame)
+is_completed = df_eligible['screening_completed_ind'].cat.codes.to_numpy() == COMPLETED_CODE
+
+# Calculate completion metrics by reach status in one pass over the codes
+reach_categories = df_eligible['reached_ind'].cat.categories
+reach_codes = df_eligible['reached_ind'].cat.codes.to_numpy(np.intp)
+compliance_by_reach = pd.DataFrame({
+    'reached_ind': reach_categories,
+    'total_screenings': np.bincount(reach_codes, minlength=len(reach_categories)),
+    'completed_screenings': np.bincount(
+        reach_codes, weights=is_completed, minlength=len(reach_categories)
+    ).astype(np.int64)
+})
+
+# Keep only reach statuses present among eligible screenings
+compliance_by_reach = compliance_by_reach[compliance_by_reach['total_screenings'] > 0].reset_index(drop=True)
 
 # Calculate completion rate and not completed count
 compliance_by_reach['completion_rate'] = (
@@ -126,13 +122,17 @@ compliance_by_reach['not_completed'] = (
     compliance_by_reach['completed_screenings']
 )
 
+# Sort once by completion rate; both graphs use this order
+compliance_sorted = compliance_by_reach.sort_values('completion_rate', ascending=False)
+
 print("\nCompletion Rates by Reach Status:")
 print(compliance_by_reach.to_string(index=False))
 
-# Extract key metrics
-reached_rate = compliance_by_reach[compliance_by_reach['reached_ind'] == 'reached']['completion_rate'].values[0]
-not_reached_rate = compliance_by_reach[compliance_by_reach['reached_ind'] == 'not reached']['completion_rate'].values[0]
-not_called_rate = compliance_by_reach[compliance_by_reach['reached_ind'] == 'not called']['completion_rate'].values[0]
+# Extract key metrics (one lookup table keyed by reach status)
+rates = dict(zip(compliance_by_reach['reached_ind'], compliance_by_reach['completion_rate']))
+reached_rate = rates['reached']
+not_reached_rate = rates['not reached']
+not_called_rate = rates['not called']
 
 # Calculate impact metrics
 absolute_impact = reached_rate - not_reached_rate
@@ -155,140 +155,134 @@ print("STEP 3: GENERATING VISUALIZATIONS")
 print(f"{'─' * 70}")
 
 # Create output directory
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-    print(f"  ✓ Created directory: {OUTPUT_DIR}")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# --- GRAPH 1: COMPLETION RATES COMPARISON ---
+# Both graphs are drawn on one reused figure; each is redrawn only when
+# its PNG is older than the data or code it is built from
+graph1_path = os.path.join(OUTPUT_DIR, 'Q3_Graph1_Completion_by_Reach.png')
+graph2_path = os.path.join(OUTPUT_DIR, 'Q3_Graph2_Outcomes_by_Reach.png')
+fig = plt.figure(layout='tight')
 
-fig, ax = plt.subplots(figsize=(10, 7))
+# --- GRAPH 1: COMPLETION RATES COMPARISON ---
 
-# Sort by completion rate for better visualization
-compliance_sorted = compliance_by_reach.sort_values('completion_rate', ascending=False)
+if FINAL_RENDER or needs_rebuild(graph1_path, PROCESSED_DATA_PATH, __file__):
+    fig.set_size_inches(10, 7)
+    ax = fig.add_subplot()
 
-# Apply color mapping
-colors_list = [REACH_COLORS[status] for status in compliance_sorted['reached_ind']]
+    # Apply color mapping
+    colors_list = [REACH_COLORS[status] for status in compliance_sorted['reached_ind']]
 
-bars = ax.bar(
-    compliance_sorted['reached_ind'], 
-    compliance_sorted['completion_rate'],
-    color=colors_list,
-    edgecolor=COLORS['dark'],
-    linewidth=1.5,
-    width=0.6
-)
+    bars = ax.bar(
+        compliance_sorted['reached_ind'], 
+        compliance_sorted['completion_rate'],
+        color=colors_list,
+        edgecolor=COLORS['dark'],
+        linewidth=1.5,
+        width=0.6
+    )
 
-# Add value labels
-for bar in bars:
-    height = bar.get_height()
-    ax.text(
-        bar.get_x() + bar.get_width()/2., 
-        height + 1,
-        f'{height:.1f}%',
-        ha='center', 
-        va='bottom', 
-        fontsize=13, 
+    # Add value labels
+    ax.bar_label(
+        bars,
+        fmt='{:.1f}%',
+        padding=3,
+        fontsize=13,
         weight='bold',
         color=COLORS['dark']
     )
 
-# Styling
-ax.set_ylabel('Screening Completion Rate (%)', fontsize=13, weight='bold', color=COLORS['dark'])
-ax.set_title(
-    'Screening Completion Rate by Reach Status', 
-    fontsize=18, 
-    weight='bold', 
-    pad=20, 
-    color=COLORS['dark']
-)
-ax.set_ylim(0, max(compliance_by_reach['completion_rate']) * 1.15)
+    # Styling
+    ax.set_ylabel('Screening Completion Rate (%)', fontsize=13, weight='bold', color=COLORS['dark'])
+    ax.set_title(
+        'Screening Completion Rate by Reach Status', 
+        fontsize=18, 
+        weight='bold', 
+        pad=20, 
+        color=COLORS['dark']
+    )
+    ax.set_ylim(0, max(compliance_by_reach['completion_rate']) * 1.15)
 
-# Grid
-ax.grid(axis='y', alpha=0.2, linestyle='-', linewidth=0.5, color=COLORS['light'])
-ax.set_axisbelow(True)
+    # Grid
+    ax.grid(axis='y', alpha=0.2, linestyle='-', linewidth=0.5, color=COLORS['light'])
+    ax.set_axisbelow(True)
 
-# Axis formatting
-ax.tick_params(axis='both', labelsize=11, colors=COLORS['dark'])
+    # Axis formatting
+    ax.tick_params(axis='both', labelsize=11, colors=COLORS['dark'])
 
-plt.tight_layout()
-graph1_path = os.path.join(OUTPUT_DIR, 'Q3_Graph1_Completion_by_Reach.png')
-plt.savefig(graph1_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"  ✓ Graph 1 saved: {graph1_path}")
-plt.close()
+    fig.savefig(graph1_path, dpi=FIGURE_DPI, facecolor='white', pil_kwargs=PNG_PIL_KWARGS)
+    print(f"  ✓ Graph 1 saved: {graph1_path}")
+else:
+    print(f"  ✓ Graph 1 up to date: {graph1_path}")
 
 # --- GRAPH 2: GROUPED BAR - COMPLETED VS NOT COMPLETED ---
 
-fig, ax = plt.subplots(figsize=(11, 7))
-
-# Sort for consistency with Graph 1
-compliance_sorted = compliance_by_reach.sort_values('completion_rate', ascending=False)
-
-x = np.arange(len(compliance_sorted))
-width = 0.35
-
-# Create grouped bars
-bars1 = ax.bar(
-    x - width/2, 
-    compliance_sorted['completed_screenings'], 
-    width, 
-    label='Completed', 
-    color=COLORS['primary'], 
-    edgecolor=COLORS['dark'], 
-    linewidth=1.5
-)
+if FINAL_RENDER or needs_rebuild(graph2_path, PROCESSED_DATA_PATH, __file__):
+    fig.clf()
+    fig.set_size_inches(11, 7)
+    ax = fig.add_subplot()
+
+    x = np.arange(len(compliance_sorted))
+    width = 0.35
+
+    # Create grouped bars
+    bars1 = ax.bar(
+        x - width/2, 
+        compliance_sorted['completed_screenings'], 
+        width, 
+        label='Completed', 
+        color=COLORS['primary'], 
+        edgecolor=COLORS['dark'], 
+        linewidth=1.5
+    )
 
-bars2 = ax.bar(
-    x + width/2, 
-    compliance_sorted['not_completed'], 
-    width, 
-    label='Not Completed', 
-    color=COLORS['accent'],
-    edgecolor=COLORS['dark'], 
-    linewidth=1.5
-)
+    bars2 = ax.bar(
+        x + width/2, 
+        compliance_sorted['not_completed'], 
+        width, 
+        label='Not Completed', 
+        color=COLORS['accent'],
+        edgecolor=COLORS['dark'], 
+        linewidth=1.5
+    )
 
-# Add value labels
-for bars in [bars1, bars2]:
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(
-            bar.get_x() + bar.get_width()/2., 
-            height,
-            f'{int(height):,}',
-            ha='center', 
-            va='bottom', 
-            fontsize=10, 
+    # Add value labels
+    for bars in [bars1, bars2]:
+        ax.bar_label(
+            bars,
+            fmt='{:,.0f}',
+            fontsize=10,
             weight='bold',
             color=COLORS['dark']
         )
 
-# Styling
-ax.set_ylabel('Number of Screenings', fontsize=13, weight='bold', color=COLORS['dark'])
-ax.set_title(
-    'Screening Outcomes by Reach Status', 
-    fontsize=18, 
-    weight='bold', 
-    pad=20, 
-    color=COLORS['dark']
-)
-ax.set_xticks(x)
-ax.set_xticklabels(compliance_sorted['reached_ind'], fontsize=11, color=COLORS['dark'])
+    # Styling
+    ax.set_ylabel('Number of Screenings', fontsize=13, weight='bold', color=COLORS['dark'])
+    ax.set_title(
+        'Screening Outcomes by Reach Status', 
+        fontsize=18, 
+        weight='bold', 
+        pad=20, 
+        color=COLORS['dark']
+    )
+    ax.set_xticks(x)
+    ax.set_xticklabels(compliance_sorted['reached_ind'], fontsize=11, color=COLORS['dark'])
 
-# Legend
-ax.legend(loc='upper right', fontsize=11, frameon=False)
+    # Legend
+    ax.legend(loc='upper right', fontsize=11, frameon=False)
 
-# Grid
-ax.grid(axis='y', alpha=0.2, linestyle='-', linewidth=0.5, color=COLORS['light'])
-ax.set_axisbelow(True)
+    # Grid
+    ax.grid(axis='y', alpha=0.2, linestyle='-', linewidth=0.5, color=COLORS['light'])
+    ax.set_axisbelow(True)
 
-# Axis formatting
-ax.tick_params(axis='y', labelsize=10, colors=COLORS['dark'])
+    # Axis formatting
+    ax.tick_params(axis='y', labelsize=10, colors=COLORS['dark'])
 
-plt.tight_layout()
-graph2_path = os.path.join(OUTPUT_DIR, 'Q3_Graph2_Outcomes_by_Reach.png')
-plt.savefig(graph2_path, dpi=300, bbox_inches='tight', facecolor='white')
-print(f"  ✓ Graph 2 saved: {graph2_path}")
-plt.close()
+    fig.savefig(graph2_path, dpi=FIGURE_DPI, facecolor='white', pil_kwargs=PNG_PIL_KWARGS)
+    print(f"  ✓ Graph 2 saved: {graph2_path}")
+else:
+    print(f"  ✓ Graph 2 up to date: {graph2_path}")
+
+plt.close(fig)
 
 # ==========================================
 # 4. SUMMARY & KEY INSIGHTS
@@ -313,12 +307,15 @@ IMPACT METRICS:
 
 DETAILED BREAKDOWN:""")
 
-for _, row in compliance_by_reach.iterrows():
-    status = row['reached_ind']
-    rate = row['completion_rate']
-    completed = int(row['completed_screenings'])
-    total = int(row['total_screenings'])
-    print(f"  • {status.title()}: {completed:,}/{total:,} screenings completed ({rate:.1f}%)")
+print("\n".join(
+    f"  • {status.title()}: {completed:,}/{total:,} screenings completed ({rate:.1f}%)"
+    for status, completed, total, rate in zip(
+        compliance_by_reach['reached_ind'],
+        compliance_by_reach['completed_screenings'],
+        compliance_by_reach['total_screenings'],
+        compliance_by_reach['completion_rate']
+    )
+))
 
 print(f"""
 VISUALIZATIONS GENERATED:
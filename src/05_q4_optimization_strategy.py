@@ -11,7 +11,7 @@ Business Question:
     compliance?"
 
 Input:
-    - data/processed/cleaned_screening_data.csv
+    - data/processed/cleaned_screening_data.parquet
 
 Outputs:
     - visualizations/q4_optimization/Q4_Graph1_Priority_Matrix.png
@@ -35,34 +35,32 @@ Date: January 2026
 """
 
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless backend; the scripts only write image files
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import os
 from datetime import datetime
 
+from config import PROCESSED_DATA_PATH, FIGURE_DPI, COLORS
+from utils import configure_matplotlib, load_cleaned, needs_rebuild
+
 # ==========================================
 # CONFIGURATION
 # ==========================================
 
 # File paths
-PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.csv'
 OUTPUT_DIR = '../visualizations/q4_optimization/'
 
-# Professional color palette
-COLORS = {
-    'primary': '#1F3A93',      # Dark blue
-    'secondary': '#3A66B7',    # Medium blue
-    'accent': '#A7C7F2',       # Light blue
-    'dark': '#4A4A4A',         # Dark gray
-    'light': '#D9D9D9'         # Light gray
-}
+# Patient-level dataset cached between runs (rebuilt when its inputs change)
+PATIENT_CACHE_PATH = '../data/processed/q4_patient_analysis.parquet'
+
+# Columns used by this analysis (only these are read from the Parquet file)
+ANALYSIS_COLUMNS = ['patient_id', 'reached_ind', 'screening_completed_ind', 'screening_type']
 
 # Matplotlib configuration
-plt.rcParams['font.family'] = 'sans-serif'
-plt.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
-plt.rcParams['axes.spines.top'] = False
-plt.rcParams['axes.spines.right'] = False
+configure_matplotlib()
 
 # ==========================================
 # 1. LOAD CLEANED DATA
@@ -73,21 +71,14 @@ print("Q4: OPTIMIZATION STRATEGY ANALYSIS")
 print("=" * 70)
 print(f"\nExecution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-# Verify file exists
-if not os.path.exists(PROCESSED_DATA_PATH):
-    raise FileNotFoundError(
-        f"Cleaned data not found: {PROCESSED_DATA_PATH}\n"
-        f"Please run 01_data_cleaning.py first."
-    )
-
-# Load cleaned data
-df = pd.read_csv(PROCESSED_DATA_PATH)
+# Load cleaned data (patient_id decoded straight from the Parquet dictionary)
+df = load_cleaned(columns=ANALYSIS_COLUMNS, read_dictionary=['patient_id'])
 
 print(f"\n{'─' * 70}")
 print("STEP 1: DATA LOADED")
 print(f"{'─' * 70}")
 print(f"Total records loaded: {len(df):,}")
-print(f"Unique patients: {df['patient_id'].nunique():,}")
+print(f"Unique patients: {len(df['patient_id'].cat.categories):,}")
 
 # ==========================================
 # 2. IDENTIFY PRIORITY PATIENT SEGMENTS
@@ -97,40 +88,77 @@ print(f"\n{'─' * 70}")
 print("STEP 2: BUILDING PRIORITY MATRIX")
 print(f"{'─' * 70}")
 
-# Filter eligible screenings
-df_eligible = df[df['screening_completed_ind'] != 'not eligible'].copy()
+# Filter eligible screenings (integer compare on the categorical codes)
+completion_status = df['screening_completed_ind'].cat
+not_eligible_code = completion_status.categories.get_loc('not eligible')
+df_eligible = df.loc[completion_status.codes.to_numpy() != not_eligible_code]
 
-# Create patient-level dataset
-patient_analysis = df_eligible.groupby('patient_id').agg(
-    total_eligible_screenings=('screening_type', 'count'),
-    completed_screenings=('screening_completed_ind', lambda x: (x == 'completed').sum()),
-    reached_status=('reached_ind', lambda x: x.mode()[0] if len(x.mode()) > 0 else x.iloc[0])
-).reset_index()
+# Flag completed screenings once so the aggregations use built-in reducers
+df_eligible = df_eligible.assign(
+    is_completed=df_eligible['screening_completed_ind'].eq('completed').astype('int8')
+)
+
+# Reuse the cached patient-level dataset unless the cleaned data or this script is newer
+if needs_rebuild(PATIENT_CACHE_PATH, PROCESSED_DATA_PATH, __file__):
+    # Create patient-level dataset in one pass over the patient codes
+    patient_categories = df_eligible['patient_id'].cat.categories
+    patient_codes = df_eligible['patient_id'].cat.codes.to_numpy(np.intp)
+    total_eligible = np.bincount(patient_codes, minlength=len(patient_categories))
+    completed_eligible = np.bincount(
+        patient_codes, weights=df_eligible['is_completed'].to_numpy(), minlength=len(patient_categories)
+    ).astype(np.int64)
+
+    # Keep only patients with at least one eligible screening
+    has_eligible = total_eligible > 0
+    patient_analysis = pd.DataFrame(
+        {
+            'total_eligible_screenings': total_eligible[has_eligible],
+            'completed_screenings': completed_eligible[has_eligible]
+        },
+        index=pd.Index(patient_categories[has_eligible], name='patient_id')
+    )
+
+    # Most frequent reach status per patient (ties go to the first category, as with mode())
+    patient_analysis['reached_status'] = (
+        df_eligible.groupby(['patient_id', 'reached_ind'], observed=True)
+        .size()
+        .unstack(fill_value=0)
+        .idxmax(axis=1)
+    )
+    patient_analysis = patient_analysis.reset_index()
 
-# Calculate compliance rate
-patient_analysis['compliance_rate'] = (
-    patient_analysis['completed_screenings'] / 
-    patient_analysis['total_eligible_screenings'] * 100
-).round(2)
+    # Calculate compliance rate
+    patient_analysis['compliance_rate'] = (
+        patient_analysis['completed_screenings'] / 
+        patient_analysis['total_eligible_screenings'] * 100
+    )
 
-print(f"Patient-level records created: {len(patient_analysis):,}")
+    patient_analysis.to_parquet(PATIENT_CACHE_PATH, index=False)
+    print(f"Patient-level records created: {len(patient_analysis):,}")
+else:
+    patient_analysis = pd.read_parquet(PATIENT_CACHE_PATH)
+    print(f"Patient-level records loaded from cache: {len(patient_analysis):,}")
 
-# Create priority matrix (patient counts by segment)
-priority_matrix = patient_analysis.groupby(['reached_status', 'total_eligible_screenings']).agg(
-    patient_count=('patient_id', 'count')
-).reset_index()
+# Create priority matrix (patient counts by segment, grouped once and reused below)
+segment_counts = patient_analysis.groupby(['reached_status', 'total_eligible_screenings'], observed=True).size()
+priority_matrix = segment_counts.reset_index(name='patient_count')
 
 print(f"\nPriority Matrix (Patient Distribution):")
 print(priority_matrix.to_string(index=False))
 
 # Calculate high-priority segment (3+ screenings, not called/not reached)
-high_priority = priority_matrix[
-    (priority_matrix['reached_status'].isin(['not called', 'not reached'])) &
-    (priority_matrix['total_eligible_screenings'] >= 3)
-]['patient_count'].sum()
+reach_status = priority_matrix['reached_status'].cat
+low_reach_codes = reach_status.categories.get_indexer(['not called', 'not reached'])
+high_priority_mask = (
+    np.isin(reach_status.codes.to_numpy(), low_reach_codes) &
+    (priority_matrix['total_eligible_screenings'].to_numpy() >= 3)
+)
+high_priority = priority_matrix['patient_count'].to_numpy()[high_priority_mask].sum()
 
-not_called_total = len(patient_analysis[patient_analysis['reached_status'] == 'not called'])
-not_reached_total = len(patient_analysis[patient_analysis['reached_status'] == 'not reached'])
+# Patient totals per reach status from the same segment counts
+status_totals = segment_counts.groupby(level='reached_status', observed=True).sum()
+not_called_total = status_totals.get('not called', 0)
+not_reached_total = status_totals.get('not reached', 0)
 
 print(f"\nKey Segment Metrics:")
 print(f"  • High-Priority Patients (3+ screenings, not called/not reached): {high_priority:,}")
@@ -146,34 +174,30 @@ print("STEP 3: ANALYZING SCREENING-SPECIFIC IMPACT")
 print(f"{'─' * 70}")
 
 # Calculate performance by screening type and reach status
-screening_performance = df_eligible.groupby(['screening_type', 'reached_ind']).agg(
+screening_performance = df_eligible.groupby(['screening_type', 'reached_ind'], observed=True).agg(
     total_screenings=('screening_type', 'count'),
-    completed=('screening_completed_ind', lambda x: (x == 'completed').sum())
-).reset_index()
+    completed=('is_completed', 'sum')
+)
 
-# Calculate completion rate
-screening_performance['completion_rate'] = (
+# Calculate completion rate (rounded here so the impact matches the displayed rates)
+completion_rate = (
     screening_performance['completed'] / 
     screening_performance['total_screenings'] * 100
 ).round(1)
 
-# Pivot for comparison
-screening_pivot = screening_performance.pivot(
-    index='screening_type', 
-    columns='reached_ind', 
-    values='completion_rate'
-).fillna(0)
+# Unstack reach status into columns for comparison
+screening_pivot = completion_rate.unstack('reached_ind').fillna(0)
 
-# Calculate impact of reaching patients
+# Calculate impact of reaching patients (formatted at display)
 screening_pivot['impact_of_reaching'] = (
     screening_pivot['reached'] - screening_pivot['not reached']
-).round(1)
+)
 
 # Sort by impact (ascending for horizontal bar chart)
 screening_pivot = screening_pivot.sort_values('impact_of_reaching', ascending=True)
 
 print("\nScreening Type Impact Analysis:")
-print(screening_pivot[['reached', 'not reached', 'impact_of_reaching']].to_string())
+print(screening_pivot[['reached', 'not reached', 'impact_of_reaching']].to_string(float_format='{:.1f}'.format))
 
 # Identify top impact screenings
 top_impact_screenings = screening_pivot.nlargest(3, 'impact_of_reaching')
@@ -193,37 +217,50 @@ print("STEP 4: GENERATING VISUALIZATIONS")
 print(f"{'─' * 70}")
 
 # Create output directory
-if not os.path.exists(OUTPUT_DIR):
-    os.makedirs(OUTPUT_DIR)
-    print(f"  ✓ Created directory: {OUTPUT_DIR}")
+os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # --- GRAPH 1: HEATMAP - PRIORITY MATRIX ---
 
 fig, ax = plt.subplots(figsize=(10, 8))
 
-# Pivot for heatmap
-pivot_counts = priority_matrix.pivot(
-    index='total_eligible_screenings',
-    columns='reached_status',
-    values='patient_count'
-).fillna(0)
-
-# Reorder columns for logical flow
-column_order = ['not called', 'not reached', 'reached']
-pivot_counts = pivot_counts[[col for col in column_order if col in pivot_counts.columns]]
-
-# Create heatmap
-sns.heatmap(
-    pivot_counts, 
-    annot=True, 
-    fmt='.0f', 
+# Pivot for heatmap (reach status columns come out in category order:
+# not called, not reached, reached)
+pivot_counts = segment_counts.unstack('reached_status', fill_value=0)
+
+# Create heatmap (cells drawn directly; first row at the top)
+counts = pivot_counts.to_numpy()
+mesh = ax.pcolormesh(
+    counts,
     cmap=sns.light_palette(COLORS['secondary'], as_cmap=True),
-    cbar_kws={'label': 'Patient Count'},
-    linewidths=2, 
-    linecolor='white',
-    annot_kws={'fontsize': 12, 'weight': 'bold'},
-    ax=ax
+    edgecolors='white',
+    linewidth=2
 )
+ax.set_xlim(0, counts.shape[1])
+ax.set_ylim(counts.shape[0], 0)
+ax.set_xticks(np.arange(counts.shape[1]) + 0.5, labels=pivot_counts.columns)
+ax.set_yticks(np.arange(counts.shape[0]) + 0.5, labels=pivot_counts.index)
+for spine in ax.spines.values():
+    spine.set_visible(False)
+
+colorbar = fig.colorbar(mesh, ax=ax, label='Patient Count')
+colorbar.outline.set_linewidth(0)
+
+# Annotate cells, using white text on dark cells (W3C relative luminance)
+mesh.update_scalarmappable()
+cell_rgb = mesh.get_facecolors()[:, :3]
+cell_rgb = np.where(cell_rgb <= 0.03928, cell_rgb / 12.92, ((cell_rgb + 0.055) / 1.055) ** 2.4)
+text_colors = np.where(cell_rgb @ [0.2126, 0.7152, 0.0722] > 0.408, '.15', 'w')
+for (row, col), count, text_color in zip(np.ndindex(counts.shape), counts.ravel(), text_colors):
+    ax.text(
+        col + 0.5,
+        row + 0.5,
+        f'{count:.0f}',
+        ha='center',
+        va='center',
+        fontsize=12,
+        weight='bold',
+        color=text_color
+    )
 
 # Styling
 ax.set_title(
@@ -242,7 +279,7 @@ ax.set_yticklabels(ax.get_yticklabels(), rotation=0, fontsize=11, color=COLORS['
 
 plt.tight_layout()
 graph1_path = os.path.join(OUTPUT_DIR, 'Q4_Graph1_Priority_Matrix.png')
-plt.savefig(graph1_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph1_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 1 saved: {graph1_path}")
 plt.close()
 
@@ -254,24 +291,22 @@ fig, ax = plt.subplots(figsize=(10, 7))
 screening_impact_data = screening_pivot['impact_of_reaching'].sort_values(ascending=True)
 
 # Color based on impact value (positive = dark blue, negative/zero = gray)
-colors_impact = [
-    COLORS['primary'] if x > 0 else COLORS['light'] 
-    for x in screening_impact_data.values
-]
+impact_values = screening_impact_data.to_numpy()
+positive_impact = impact_values > 0
+colors_impact = np.where(positive_impact, COLORS['primary'], COLORS['light']).tolist()
 
 bars = ax.barh(
     screening_impact_data.index, 
-    screening_impact_data.values,
+    impact_values,
     color=colors_impact, 
     edgecolor=COLORS['dark'], 
     linewidth=1.5
 )
 
-# Add value labels
-for i, bar in enumerate(bars):
-    width = bar.get_width()
-    label_x = width + (0.5 if width > 0 else -0.5)
-    ha = 'left' if width > 0 else 'right'
+# Add value labels (outside the bar end: right of positive bars, left of others)
+label_xs = impact_values + np.where(positive_impact, 0.5, -0.5)
+alignments = np.where(positive_impact, 'left', 'right')
+for bar, width, label_x, ha in zip(bars, impact_values, label_xs, alignments):
     ax.text(
         label_x, 
         bar.get_y() + bar.get_height()/2,
@@ -305,7 +340,7 @@ ax.tick_params(axis='both', labelsize=11, colors=COLORS['dark'])
 
 plt.tight_layout()
 graph2_path = os.path.join(OUTPUT_DIR, 'Q4_Graph2_Screening_Impact.png')
-plt.savefig(graph2_path, dpi=300, bbox_inches='tight', facecolor='white')
+plt.savefig(graph2_path, dpi=FIGURE_DPI, bbox_inches='tight', facecolor='white')
 print(f"  ✓ Graph 2 saved: {graph2_path}")
 plt.close()
 
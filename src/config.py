@@ -0,0 +1,35 @@
+"""
+Shared Configuration
+====================
+
+Settings shared by the cleaning and analysis scripts. Paths are relative
+to src/, which is the working directory the scripts are run from.
+"""
+
+import os
+
+# Cleaned dataset written by 01_data_cleaning.py and read by the Q scripts
+PROCESSED_DATA_PATH = '../data/processed/cleaned_screening_data.parquet'
+
+# Figure resolution: 150 DPI for working runs, 300 DPI with FINAL_RENDER=1
+FINAL_RENDER = os.environ.get('FINAL_RENDER') == '1'
+FIGURE_DPI = 300 if FINAL_RENDER else 150
+
+# PNG compression: fast zlib level for working runs, library default for final renders
+PNG_PIL_KWARGS = {} if FINAL_RENDER else {'compress_level': 1}
+
+# Professional color palette
+COLORS = {
+    'primary': '#1F3A93',      # Dark blue
+    'secondary': '#3A66B7',    # Medium blue
+    'accent': '#A7C7F2',       # Light blue
+    'dark': '#4A4A4A',         # Dark gray
+    'light': '#D9D9D9'         # Light gray
+}
+
+# Color mapping for reach status
+REACH_COLORS = {
+    'reached': '#1F3A93',      # Dark blue (best performance)
+    'not reached': '#3A66B7',  # Medium blue
+    'not called': '#D9D9D9'    # Light gray (baseline)
+}
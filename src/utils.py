@@ -0,0 +1,72 @@
+"""
+Shared Utilities
+================
+
+Helpers shared by the analysis scripts.
+"""
+
+import os
+from functools import lru_cache
+
+import matplotlib
+import pandas as pd
+
+import config
+from config import PROCESSED_DATA_PATH
+
+
+def configure_matplotlib():
+    """Apply the house plot style (sans-serif fonts, no top/right spines)."""
+    matplotlib.rcParams['font.family'] = 'sans-serif'
+    matplotlib.rcParams['font.sans-serif'] = ['Arial', 'Helvetica', 'DejaVu Sans']
+    matplotlib.rcParams['axes.spines.top'] = False
+    matplotlib.rcParams['axes.spines.right'] = False
+
+
+def load_cleaned(columns=None, read_dictionary=None):
+    """
+    Load the cleaned screening dataset written by 01_data_cleaning.py.
+
+    Args:
+        columns: Optional list of columns to read; all columns when None.
+        read_dictionary: Optional list of string columns to decode as
+            categoricals straight from the Parquet dictionary pages.
+
+    Frames are cached for the life of the process, so analyses run
+    back-to-back in one interpreter read the file once per column set.
+    Callers must not modify the returned frame in place.
+    """
+    return _read_cleaned(
+        tuple(columns) if columns is not None else None,
+        tuple(read_dictionary) if read_dictionary is not None else None
+    )
+
+
+@lru_cache(maxsize=4)
+def _read_cleaned(columns, read_dictionary):
+    if not os.path.exists(PROCESSED_DATA_PATH):
+        raise FileNotFoundError(
+            f"Cleaned data not found: {PROCESSED_DATA_PATH}\n"
+            f"Please run 01_data_cleaning.py first."
+        )
+
+    return pd.read_parquet(
+        PROCESSED_DATA_PATH,
+        columns=list(columns) if columns is not None else None,
+        read_dictionary=list(read_dictionary) if read_dictionary is not None else None
+    )
+
+
+def needs_rebuild(output_path, *input_paths):
+    """
+    Return True when output_path is missing or older than any input.
+
+    The shared config and utils modules always count as inputs, since
+    they set the palette, figure DPI and plot style.
+    """
+    if not os.path.exists(output_path):
+        return True
+
+    output_mtime = os.path.getmtime(output_path)
+    sources = (*input_paths, config.__file__, __file__)
+    return any(os.path.getmtime(path) > output_mtime for path in sources)